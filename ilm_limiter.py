@@ -1,39 +1,47 @@
 #!/usr/bin/env python3
 
 import argparse
+import collections
+import concurrent.futures
 import elasticsearch
+import functools
 import os
+import re
 import signal
 import sys
+import threading
 import logging
-
-from schema import Optional, Or, Schema, SchemaError
+import operator
 
 
 def parse_arguments():
     """parse arguments"""
 
+    url = os.environ.get("ELASTICSEARCH_HOST")
+    username = os.environ.get("ELASTICSEARCH_AUTH_USR")
+    password = os.environ.get("ELASTICSEARCH_AUTH_PSW")
+
     parser = argparse.ArgumentParser(description="ILM Limiter")
     parser.add_argument(
         "--url",
         type=str,
         help="url with protocol and port (falls back to env var ELASTICSEARCH_HOST)",
-        default=os.environ.get("ELASTICSEARCH_HOST"),
-        required="ELASTICSEARCH_HOST" not in os.environ.keys(),
+        default=url,
+        required=url is None,
     )
     parser.add_argument(
         "--username",
         type=str,
         help="username (falls back to env var ELASTICSEARCH_AUTH_USR)",
-        default=os.environ.get("ELASTICSEARCH_AUTH_USR"),
-        required="ELASTICSEARCH_AUTH_USR" not in os.environ.keys(),
+        default=username,
+        required=username is None,
     )
     parser.add_argument(
         "--password",
         type=str,
         help="password (falls back to env var ELASTICSEARCH_AUTH_PSW)",
-        default=os.environ.get("ELASTICSEARCH_AUTH_PSW"),
-        required="ELASTICSEARCH_AUTH_PSW" not in os.environ.keys(),
+        default=password,
+        required=password is None,
     )
     parser.add_argument(
         "--dry-run",
@@ -64,49 +72,89 @@ def configure_logging(debug: bool):
     logging.getLogger("urllib3.connectionpool").level = logging.ERROR
 
 
+# units with their multiplier to convert to bytes
+size_units = {"kb": 1024, "mb": 1024**2, "gb": 1024**3, "tb": 1024**4}
+size_pattern = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*(kb|mb|gb|tb)\s*$", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
 def convert_size_to_bytes(size: str) -> int:
     """Convert bytes with units to bytes."""
 
-    units = ["kb", "mb", "gb", "tb"]
-    factor = 1024
+    match = size_pattern.match(size)
+    if not match:
+        raise ValueError("could not convert '{}' to bytes".format(size))
 
-    for step, unit in enumerate(units):
-        if size.lower().endswith(unit):
-            return int(float(size[0 : -len(unit)]) * (factor ** (step + 1)))
-
-    raise ValueError("could not convert '{}' to bytes".format(size))
+    return int(float(match.group(1)) * size_units[match.group(2).lower()])
 
 
 def convert_bytes_to_size(bytes: int) -> str:
     """Convert bytes to bytes with units."""
 
     units = ["b", "kb", "mb", "gb", "tb"]
-    factor = 1024
 
-    step = 0
-    while bytes >= factor and step < len(units) - 1:
-        step += 1
-        bytes /= factor
+    # every unit is 2^10 times the previous one, so the bit length determines the unit
+    step = min(max((int(bytes).bit_length() - 1) // 10, 0), len(units) - 1)
+
+    return "{:.2f}{}".format(bytes / (1024**step), units[step])
+
+
+def split_into_batches(names: list[str], max_joined_length: int) -> list[list[str]]:
+    """Split names into consecutive batches whose comma-joined length stays within max_joined_length."""
 
-    return "{:.2f}{}".format(bytes, units[step])
+    batches = []
+    batch = []
+    batch_length = 0
+
+    for name in names:
+        # account for the comma separating the name from the previous one
+        name_length = len(name) + (1 if batch else 0)
+        if batch and batch_length + name_length > max_joined_length:
+            batches.append(batch)
+            batch = []
+            name_length = len(name)
+            batch_length = 0
+
+        batch.append(name)
+        batch_length += name_length
+
+    if batch:
+        batches.append(batch)
+
+    return batches
 
 
 class Ilm_limiter:
     # ILM phases in their actual order, the last phase in this list will be ignored
     global_lifecycle_phases = ["hot", "warm", "cold", "frozen", "delete"]
+    global_lifecycle_phases_order = {phase: position for position, phase in enumerate(global_lifecycle_phases)}
+    global_lifecycle_phases_limitable_reversed = tuple(reversed(global_lifecycle_phases[:-1]))
 
     cluster_privileges = ["manage", "manage_ilm"]
     index_privileges = ["manage"]
 
+    # upper bound of the comma-joined index names per explain_lifecycle / cat.shards request, keeping the request
+    # line well below the default http.max_initial_line_length of 4kb (names are 45 characters with data streams)
+    max_index_names_length_per_request = 3000
+
+    # upper bound of lifecycles checked in parallel (moves are bounded separately by max_parallel_moves)
+    max_parallel_lifecycles = 8
+
+    # upper bound of move_to_step requests issued in parallel, to not flood the cluster with ILM tasks
+    max_parallel_moves = 32
+
     def __init__(self, elasticsearch_client: elasticsearch.Elasticsearch, dry_run=False):
         self.es = elasticsearch_client
         self.dry_run = dry_run
 
+        # bound move_to_step requests across all phases and lifecycles checked in parallel
+        self.move_semaphore = threading.BoundedSemaphore(self.max_parallel_moves)
+
     def check_cluster_privileges(self):
         """check required cluster privileges"""
 
         privileges = self.es.security.has_privileges(cluster=self.cluster_privileges)
-        logging.debug("cluster privileges: {}".format(privileges))
+        logging.debug("cluster privileges: %s", privileges)
 
         if not privileges["has_all_requested"]:
             raise ValueError("user is missing cluster privileges {}".format(self.cluster_privileges))
@@ -116,7 +164,7 @@ class Ilm_limiter:
 
         if indexes:
             privileges = self.es.security.has_privileges(index=[{"names": indexes, "privileges": self.index_privileges}])
-            logging.debug("index privileges: {}".format(privileges))
+            logging.debug("index privileges: %s", privileges)
 
             if not privileges["has_all_requested"]:
                 raise ValueError("user is missing index privileges {} on {}".format(self.index_privileges, indexes))
@@ -124,18 +172,23 @@ class Ilm_limiter:
     def run_limits(self):
         """run limiter on applicable lifecycles"""
 
-        # ensure we have required privileges for moving indexes
-        self.check_cluster_privileges()
+        # ensure we have required privileges for moving indexes (nothing gets moved in dry-run mode)
+        if not self.dry_run:
+            self.check_cluster_privileges()
 
         # get lifecycles that have an ilm-limiter configuration
         lifecycles = self.get_lifecycles()
 
-        # check lifecycles one by one
-        for lifecycle_name, lifecycle_properties in lifecycles.items():
-            try:
-                self.check_lifecycle(lifecycle_name, lifecycle_properties)
-            except ValueError as e:
-                logging.error(e)
+        # check lifecycles in parallel, their moves share move_semaphore so at most max_parallel_moves run at once
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_parallel_lifecycles) as executor:
+            futures = [
+                executor.submit(self.check_lifecycle, lifecycle_name, lifecycle_properties) for lifecycle_name, lifecycle_properties in lifecycles.items()
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                except ValueError as e:
+                    logging.error(e)
 
         # log summary of all configured limits
         self.log_lifecycle_stats(lifecycles)
@@ -143,16 +196,17 @@ class Ilm_limiter:
     def log_lifecycle_stats(self, lifecycles: dict):
         """create a summary of all configured limits"""
 
-        phases = {}
+        phases = collections.defaultdict(int)
+        phases_order = self.global_lifecycle_phases_order
 
         for lifecycle_properties in lifecycles.values():
             for lifecycle_phase_name, lifecycle_phase_properties in lifecycle_properties["policy"]["phases"].items():
-                if "limits" in lifecycle_phase_properties:
-                    phases.setdefault(lifecycle_phase_name, 0)
-                    phases[lifecycle_phase_name] += lifecycle_phase_properties["limits"]["max_size_bytes"]
+                lifecycle_phase_limits = lifecycle_phase_properties.get("limits")
+                if lifecycle_phase_limits is not None:
+                    phases[lifecycle_phase_name] += lifecycle_phase_limits["max_size_bytes"]
 
-        for phase, limit in sorted(phases.items(), key=lambda p: self.global_lifecycle_phases.index(p[0])):
-            logging.info("sum of limits on all lifecycle phases '{}': {}".format(phase, convert_bytes_to_size(limit)))
+        for phase, limit in sorted(phases.items(), key=lambda p: phases_order[p[0]]):
+            logging.info("sum of limits on all lifecycle phases '%s': %s", phase, convert_bytes_to_size(limit))
 
     def get_lifecycles(self) -> dict:
         """return all lifecycles that have an ilm-limiter configuration"""
@@ -170,65 +224,70 @@ class Ilm_limiter:
     def is_lifecycle_limited(self, lifecycle_name: str, lifecycle_properties: dict) -> bool:
         """verify if a lifecycle has a valid ilm-limiter configuration in its _meta object"""
 
-        schema = Schema(
-            {
-                "_meta": {
-                    "ilm-limiter": {"phases": {str: {"max_size": convert_size_to_bytes}}},
-                    Optional(str): Or(dict, str, list),
-                },
-                "phases": dict,
-            }
-        )
-
         try:
-            schema.validate(lifecycle_properties["policy"])
-            logging.debug("lifecycle '{}' has a valid ilm-limiter configuration".format(lifecycle_name))
+            self.validate_lifecycle_policy(lifecycle_properties.get("policy") or {})
+            logging.debug("lifecycle '%s' has a valid ilm-limiter configuration", lifecycle_name)
             return True
-        except SchemaError as e:
-            logging.debug("lifecycle '{}' has a no valid ilm-limiter configuration ({})".format(lifecycle_name, e))
+        except ValueError as e:
+            logging.debug("lifecycle '%s' has a no valid ilm-limiter configuration (%s)", lifecycle_name, e)
             return False
 
+    def validate_lifecycle_policy(self, policy: dict):
+        """raise ValueError if a lifecycle policy has no valid ilm-limiter configuration"""
+
+        meta = policy.get("_meta") or {}
+        if not isinstance(meta.get("ilm-limiter"), dict) or not isinstance(meta["ilm-limiter"].get("phases"), dict):
+            raise ValueError("missing 'ilm-limiter.phases' object in '_meta'")
+
+        if not isinstance(policy.get("phases"), dict):
+            raise ValueError("missing 'phases' object")
+
+        for phase, limits in meta["ilm-limiter"]["phases"].items():
+            if not isinstance(limits, dict) or not isinstance(limits.get("max_size"), str):
+                raise ValueError("phase '{}' has no 'max_size'".format(phase))
+
+            convert_size_to_bytes(limits["max_size"])
+
     def decode_lifecycle_phases(self, lifecycle_name: str, lifecycle_properties: dict) -> dict:
         """merge lifecycle limits from _meta object with their phases"""
 
         # limits from lifecycle '_meta'
         lifecycle_phases_limits = lifecycle_properties["policy"]["_meta"]["ilm-limiter"]["phases"]
+        lifecycle_phases = lifecycle_properties["policy"]["phases"]
 
         for phase, limits in lifecycle_phases_limits.items():
-            if phase in lifecycle_properties["policy"]["phases"]:
+            if phase in lifecycle_phases:
                 # extend limits object with max_size converted to bytes
-                limits_extended = limits | {"max_size_bytes": convert_size_to_bytes(limits["max_size"])}
-                lifecycle_properties["policy"]["phases"][phase]["limits"] = limits_extended
+                limits["max_size_bytes"] = convert_size_to_bytes(limits["max_size"])
+                lifecycle_phases[phase]["limits"] = limits
             else:
-                logging.warning("lifecycle '{}' has no phase '{}' but limits".format(lifecycle_name, phase))
+                logging.warning("lifecycle '%s' has no phase '%s' but limits", lifecycle_name, phase)
 
         return lifecycle_properties
 
     def check_lifecycle(self, lifecycle_name: str, lifecycle_properties: dict):
         """check all phases of a lifecycle"""
 
-        logging.info("check lifecycle '{}'".format(lifecycle_name))
+        logging.info("check lifecycle '%s'", lifecycle_name)
 
         # get indexes using the lifecycle
         lifecycle_indexes = lifecycle_properties["in_use_by"]["indices"]
 
-        # ensure we have required privileges for moving indexes
-        self.check_index_privileges(lifecycle_indexes)
+        # ensure we have required privileges for moving indexes (nothing gets moved in dry-run mode)
+        if not self.dry_run:
+            self.check_index_privileges(lifecycle_indexes)
 
         # get indexes in lifecycle grouped by phases
         lifecycle_phases_indexes = self.get_indexes_in_phases(lifecycle_indexes)
 
-        # filter for the phases we know about / know their order
-        lifecycle_phases = {
-            lifecycle_phase_name: lifecycle_phase_properties
-            for lifecycle_phase_name, lifecycle_phase_properties in lifecycle_properties["policy"]["phases"].items()
-            if lifecycle_phase_name in self.global_lifecycle_phases[:-1]
-        }
+        lifecycle_phases = lifecycle_properties["policy"]["phases"]
+
+        # go over the phases we know about / know their order in reverse order
+        for lifecycle_phase_name in self.global_lifecycle_phases_limitable_reversed:
+            lifecycle_phase_properties = lifecycle_phases.get(lifecycle_phase_name)
+            if lifecycle_phase_properties is None:
+                continue
 
-        # go over known phases in reverse order
-        for lifecycle_phase_name, lifecycle_phase_properties in sorted(
-            lifecycle_phases.items(), key=lambda p: self.global_lifecycle_phases.index(p[0]), reverse=True
-        ):
             # check if phase has limits configured
             if "limits" in lifecycle_phase_properties:
                 lifecycle_phase_limits = lifecycle_phase_properties["limits"]
@@ -236,9 +295,11 @@ class Ilm_limiter:
                 lifecycle_phase_next = self.get_next_lifecycle_phase(lifecycle_properties, lifecycle_phase_name)
 
                 logging.info(
-                    "lifecycle '{}', phase '{}' is limited to {}, next phase: '{}'".format(
-                        lifecycle_name, lifecycle_phase_name, lifecycle_phase_limits["max_size"], lifecycle_phase_next
-                    )
+                    "lifecycle '%s', phase '%s' is limited to %s, next phase: '%s'",
+                    lifecycle_name,
+                    lifecycle_phase_name,
+                    lifecycle_phase_limits["max_size"],
+                    lifecycle_phase_next,
                 )
                 self.check_lifecycle_phase(
                     lifecycle_name,
@@ -248,14 +309,16 @@ class Ilm_limiter:
                     lifecycle_phase_indexes,
                 )
             else:
-                logging.info("lifecycle '{}', phase '{}' is not limited".format(lifecycle_name, lifecycle_phase_name))
+                logging.info("lifecycle '%s', phase '%s' is not limited", lifecycle_name, lifecycle_phase_name)
 
     def get_next_lifecycle_phase(self, lifecycle_properties: dict, current_phase: str) -> str:
         """for the given 'current phase', determine the next phase in the lifecycle policy"""
 
-        index_current_phase = self.global_lifecycle_phases.index(current_phase)
+        lifecycle_phases = lifecycle_properties["policy"]["phases"]
+
+        index_current_phase = self.global_lifecycle_phases_order[current_phase]
         for phase in self.global_lifecycle_phases[index_current_phase + 1 :]:
-            if phase in lifecycle_properties["policy"]["phases"]:
+            if phase in lifecycle_phases:
                 return phase
 
         raise ValueError("cannot determine successor of phase '{}'".format(current_phase))
@@ -266,27 +329,51 @@ class Ilm_limiter:
         """check all indexes in a phase"""
 
         disk_usage_phase_limit = lifecycle_phase_limit["max_size_bytes"]
+        disk_usage_phase_limit_size = convert_bytes_to_size(disk_usage_phase_limit)
         disk_usage_phase_sum = 0
+        indexes_to_move = {}
+        dry_run = self.dry_run
+        log_info_enabled = logging.getLogger().isEnabledFor(logging.INFO)
 
-        # iterate over indexes in reverse chronological order
-        for index_name, index_current_ilm_step in sorted(
-            lifecycle_phase_indexes.items(),
-            key=lambda item: self.get_index_lifecycle_date(item[0]),
-            reverse=True,
-        ):
-            disk_usage_index = self.get_index_total_dataset_size(index_name)
-            disk_usage_phase_sum += disk_usage_index
+        # get disk usage of all indexes in the phase with a single request
+        disk_usage_indexes = self.get_index_total_dataset_sizes(list(lifecycle_phase_indexes))
 
+        # no index can exceed the limit if the whole phase does not
+        disk_usage_phase_total = sum(disk_usage_indexes.values())
+        if disk_usage_phase_total <= disk_usage_phase_limit:
             logging.info(
-                "lifecycle '{}', phase '{}', index '{}': usage={}, total={}, limit={}".format(
+                "lifecycle '%s', phase '%s' is within its limit: total=%s, limit=%s",
+                lifecycle_name,
+                lifecycle_phase,
+                convert_bytes_to_size(disk_usage_phase_total),
+                disk_usage_phase_limit_size,
+            )
+            return
+
+        # sort indexes in reverse chronological order, skipping indexes without shards (deleted since they were explained)
+        lifecycle_phase_records = [
+            (index_name, index_current_ilm_step, index_current_ilm_step["lifecycle_date_millis"])
+            for index_name, index_current_ilm_step in lifecycle_phase_indexes.items()
+            if index_name in disk_usage_indexes
+        ]
+        lifecycle_phase_records.sort(key=operator.itemgetter(2), reverse=True)
+
+        get_disk_usage_index = disk_usage_indexes.get
+
+        for index_name, index_current_ilm_step, _ in lifecycle_phase_records:
+            disk_usage_index = get_disk_usage_index(index_name)
+            disk_usage_phase_sum += disk_usage_index
+
+            if log_info_enabled:
+                logging.info(
+                    "lifecycle '%s', phase '%s', index '%s': usage=%s, total=%s, limit=%s",
                     lifecycle_name,
                     lifecycle_phase,
                     index_name,
                     convert_bytes_to_size(disk_usage_index),
                     convert_bytes_to_size(disk_usage_phase_sum),
-                    convert_bytes_to_size(disk_usage_phase_limit),
+                    disk_usage_phase_limit_size,
                 )
-            )
 
             # check if summed up index disk usage exceeds the limit
             if disk_usage_phase_sum > disk_usage_phase_limit:
@@ -294,85 +381,144 @@ class Ilm_limiter:
                 # check if index is in the final state of the current phase
                 if index_current_ilm_step["action"] == "complete" and index_current_ilm_step["name"] == "complete":
                     logging.info(
-                        "lifecycle '{}', phase '{}', index '{}' is moved to phase '{}'{}".format(
-                            lifecycle_name,
-                            lifecycle_phase,
-                            index_name,
-                            lifecycle_phase_next,
-                            " (DRY-RUN)" if self.dry_run else "",
-                        )
+                        "lifecycle '%s', phase '%s', index '%s' is moved to phase '%s'%s",
+                        lifecycle_name,
+                        lifecycle_phase,
+                        index_name,
+                        lifecycle_phase_next,
+                        " (DRY-RUN)" if dry_run else "",
                     )
 
-                    if not self.dry_run:
-                        try:
-                            self.es.ilm.move_to_step(index=index_name, current_step=index_current_ilm_step, next_step={"phase": lifecycle_phase_next})
-                        except elasticsearch.BadRequestError as e:
-                            # catch when ILM has moved or deleted the index just now (may happen when ilm-limiter runs at the same time as ILM)
-                            logging.error("index got moved or deleted: {}".format(e))
+                    if not dry_run:
+                        indexes_to_move[index_name] = index_current_ilm_step
 
                 else:
                     logging.error(
-                        "lifecycle '{}', phase '{}', index '{}' cannot be moved as it is in a non-steady step: {}".format(
-                            lifecycle_name, lifecycle_phase, index_name, index_current_ilm_step
-                        )
+                        "lifecycle '%s', phase '%s', index '%s' cannot be moved as it is in a non-steady step: %s",
+                        lifecycle_name,
+                        lifecycle_phase,
+                        index_name,
+                        index_current_ilm_step,
                     )
 
+        self.move_indexes_to_phase(indexes_to_move, lifecycle_phase_next)
+
+    def move_indexes_to_phase(self, indexes: dict, phase: str):
+        """move indexes to the given phase, issuing the requests in parallel"""
+
+        if not indexes:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(indexes), self.max_parallel_moves)) as executor:
+            futures = [
+                executor.submit(self.move_index_to_phase, index_name, index_current_ilm_step, phase) for index_name, index_current_ilm_step in indexes.items()
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                except elasticsearch.BadRequestError as e:
+                    # catch when ILM has moved or deleted the index just now (may happen when ilm-limiter runs at the same time as ILM)
+                    logging.error("index got moved or deleted: %s", e)
+
+    def move_index_to_phase(self, index_name: str, index_current_ilm_step: dict, phase: str):
+        """move an index from its current ilm step to the given phase"""
+
+        # move_to_step only accepts the step itself, not the cached lifecycle date
+        current_step = {key: index_current_ilm_step[key] for key in ("phase", "action", "name")}
+        with self.move_semaphore:
+            self.es.ilm.move_to_step(index=index_name, current_step=current_step, next_step={"phase": phase})
+
     def get_indexes_in_phases(self, index_names: list) -> dict:
         """divide indexes into their phases"""
 
-        phases = {}
+        phases = collections.defaultdict(dict)
 
-        for index_name in index_names:
-            index_current_ilm_step = self.get_index_current_ilm_step(index_name)
+        # explain indexes in batches
+        for index_names_batch in split_into_batches(index_names, self.max_index_names_length_per_request):
+            explain_indices = self.explain_indexes(index_names_batch)
 
-            logging.debug("index '{}' current ilm step: {}".format(index_name, index_current_ilm_step))
+            for index_name in index_names_batch:
+                if index_name not in explain_indices:
+                    logging.warning("index '%s' is not managed by ilm or got deleted, skipping it", index_name)
+                    continue
 
-            phases.setdefault(index_current_ilm_step["phase"], {})[index_name] = index_current_ilm_step
+                ilm = explain_indices[index_name]
+                index_current_ilm_step = {
+                    "phase": ilm["phase"],
+                    "action": ilm["action"],
+                    "name": ilm["step"],
+                    # before rollover that is the creation date, otherwise the rollover date
+                    "lifecycle_date_millis": int(ilm["lifecycle_date_millis"]),
+                }
 
-        return phases
+                logging.debug("index '%s' current ilm step: %s", index_name, index_current_ilm_step)
 
-    def get_index_current_ilm_step(self, index_name: str) -> dict:
-        """get current ilm phase, action and step of an index"""
+                phases[index_current_ilm_step["phase"]][index_name] = index_current_ilm_step
 
-        ilm = self.es.ilm.explain_lifecycle(index=index_name)
-        ilm_phase = ilm["indices"][index_name]["phase"]
-        ilm_action = ilm["indices"][index_name]["action"]
-        ilm_step = ilm["indices"][index_name]["step"]
+        return phases
 
-        index_current_ilm_step = {
-            "phase": ilm_phase,
-            "action": ilm_action,
-            "name": ilm_step,
-        }
+    def explain_indexes(self, index_names: list[str]) -> dict:
+        """explain the lifecycle of managed indexes, limited to the fields we need"""
+
+        try:
+            explain = self.es.ilm.explain_lifecycle(
+                index=",".join(index_names),
+                only_managed=True,
+                filter_path=["indices.*.phase", "indices.*.action", "indices.*.step", "indices.*.lifecycle_date_millis"],
+            )
+            return explain.get("indices", {})
+        except elasticsearch.NotFoundError:
+            # a single deleted index fails the whole request (may happen when ILM deleted it since the lifecycles were read)
+            if len(index_names) == 1:
+                return {}
+
+        # fall back to explaining the indexes one by one to skip the deleted ones
+        explain_indices = {}
+        for index_name in index_names:
+            explain_indices |= self.explain_indexes([index_name])
 
-        return index_current_ilm_step
+        return explain_indices
 
     def get_index_creation_date(self, index_name: str) -> int:
         """get creation date of an index"""
 
         settings = self.es.indices.get_settings(index=index_name)
         index_creation_date = int(settings[index_name]["settings"]["index"]["creation_date"])
-        logging.debug("index '{}' creation date: {}".format(index_name, index_creation_date))
+        logging.debug("index '%s' creation date: %s", index_name, index_creation_date)
 
         return index_creation_date
 
-    def get_index_lifecycle_date(self, index_name: str) -> int:
-        """get lifecycle date of an index (before rollover that is the creation date, otherwise the rollover date)"""
+    def get_index_shards(self, index_names: list[str]) -> list:
+        """get index name and dataset size of all shards of the indexes"""
 
-        explain = self.es.ilm.explain_lifecycle(index=index_name)
-        index_lifecycle_date = int(explain["indices"][index_name]["lifecycle_date_millis"])
-        logging.debug("index '{}' lifecycle date: {}".format(index_name, index_lifecycle_date))
+        try:
+            return self.es.cat.shards(index=",".join(index_names), h="index,dataset", format="json", bytes="b")
+        except elasticsearch.NotFoundError:
+            # a single deleted index fails the whole request (may happen when ILM deleted it since it was explained)
+            if len(index_names) == 1:
+                logging.warning("index '%s' got deleted, skipping it", index_names[0])
+                return []
+
+        # fall back to requesting the indexes one by one to skip the deleted ones
+        shards = []
+        for index_name in index_names:
+            shards += self.get_index_shards([index_name])
 
-        return index_lifecycle_date
+        return shards
 
-    def get_index_total_dataset_size(self, index_name: str) -> int:
-        """get total dataset size of an index"""
+    def get_index_total_dataset_sizes(self, index_names: list) -> dict:
+        """get total dataset size of multiple indexes"""
 
-        shards = self.es.cat.shards(index=index_name, format="json", bytes="b")
-        index_disk_usage = sum(int(shard["dataset"] or 0) for shard in shards)
-        logging.debug("index '{}' disk usage: {}".format(index_name, index_disk_usage))
+        index_disk_usages = collections.defaultdict(int)
 
-        return index_disk_usage
+        for index_names_batch in split_into_batches(index_names, self.max_index_names_length_per_request):
+            for shard in self.get_index_shards(index_names_batch):
+                index_disk_usages[shard["index"]] += int(shard["dataset"] or 0)
+
+        for index_name, index_disk_usage in index_disk_usages.items():
+            logging.debug("index '%s' disk usage: %s", index_name, index_disk_usage)
+
+        return index_disk_usages
 
 
 def signal_handler(signum, frame):
@@ -391,9 +537,17 @@ def main():
 
     # connect to elasticsearch
     try:
-        es = elasticsearch.Elasticsearch(args.url, basic_auth=(args.username, args.password), request_timeout=args.timeout, headers={"X-Caller": "ilm-limiter"})
+        es = elasticsearch.Elasticsearch(
+            args.url,
+            basic_auth=(args.username, args.password),
+            request_timeout=args.timeout,
+            # size the connection pool for the global bound of parallel requests (lifecycle checks plus shared moves)
+            connections_per_node=Ilm_limiter.max_parallel_lifecycles + Ilm_limiter.max_parallel_moves,
+            http_compress=True,
+            headers={"X-Caller": "ilm-limiter"},
+        )
     except ValueError as e:
-        logging.error("elasticsearch ({}): {}".format(args.url, e))
+        logging.error("elasticsearch (%s): %s", args.url, e)
         return 1
 
     # create and run limiter
@@ -404,7 +558,7 @@ def main():
         logging.error(e)
         return 1
     except (elasticsearch.AuthenticationException, elasticsearch.ConnectionError, elasticsearch.ConnectionTimeout) as e:
-        logging.error("elasticsearch ({}): {}".format(args.url, e))
+        logging.error("elasticsearch (%s): %s", args.url, e)
         return 1
 
     return 0